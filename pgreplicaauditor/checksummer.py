@@ -2,6 +2,9 @@
 Assumes that both tables have "id" and "updated_at" columns and indexes on those columns.'''
 import psycopg2
 import os
+import sys
+import types
+import io
 from tqdm import tqdm
 from colorama import Fore
 import colorama
@@ -12,35 +15,72 @@ from datadiff import diff
 from datetime import datetime
 from multiprocessing.pool import ThreadPool
 import math
+import itertools
+import queue
+import threading
 
-colorama.init()
+# Colors only help a terminal; piped into a file or CI log they are just noise.
+if sys.stdout.isatty():
+    colorama.init()
+else:
+    Fore = types.SimpleNamespace(BLUE='', CYAN='', GREEN='', RED='', YELLOW='', RESET='')
 
 ROWS = 8128
+BATCH_SIZE = 512
+PAGE_SIZE = 250
+WORKERS = 4
+SSLMODES = ['disable', 'allow', 'prefer', 'require', 'verify-ca', 'verify-full']
+# Row hashes are taken over the rows' text form, which depends on these; pin them so both sides agree.
+SESSION_OPTIONS = '-c TimeZone=UTC -c DateStyle=ISO -c IntervalStyle=postgres -c extra_float_digits=3 -c bytea_output=hex'
 VERSION = '0.15'
 
 __version__ = VERSION
 __author__ = 'Lev Kokotov <lev.kokotov@instacart.com>'
 
+_pool = None
+_pool_lock = threading.Lock()
+_known_columns = {}
+_debugging = bool(os.getenv('DEBUG')) # Read again in main(), after the CLI had its say
+
 
 def _debug(cursor):
     '''Print the executed query in a pretty color.'''
-    if os.getenv('DEBUG'):
-        print(Fore.BLUE, '\b{}: '.format(cursor.connection.dsn) + cursor.query.decode('utf-8'), Fore.RESET)
+    if _debugging:
+        print(Fore.BLUE + '{}: '.format(cursor.connection.dsn) + cursor.query.decode('utf-8') + Fore.RESET)
 
 
 def _debug2(text):
-    if os.getenv('DEBUG'):
+    if _debugging:
         _debug3(text)
 
 
 def _debug3(text):
-    print(Fore.BLUE, '\b{}'.format(text), Fore.RESET)
+    print(Fore.BLUE + '{}'.format(text) + Fore.RESET)
+
+
+def _connect(dsn, sslmode=None):
+    '''Connect with SESSION_OPTIONS added after any options the DSN already has, so ours win.'''
+    options = {'options': ' '.join(filter(None, [psycopg2.extensions.parse_dsn(dsn).get('options'), SESSION_OPTIONS]))}
+    if sslmode:
+        options['sslmode'] = sslmode
 
+    return psycopg2.connect(dsn, **options)
 
-def connect():
-    '''Connect to source and replicaination DBs.'''
-    primary = psycopg2.connect(os.getenv('PRIMARY_DB_URL'))
-    replica = psycopg2.connect(os.getenv('REPLICA_DB_URL'))
+
+def connect(sslmode=None):
+    '''Connect to source and replicaination DBs, overriding the DSNs' sslmode if given.'''
+    primary = _connect(os.getenv('PRIMARY_DB_URL'), sslmode)
+    replica = _connect(os.getenv('REPLICA_DB_URL'), sslmode)
+
+    return primary, replica
+
+
+def _cursors(sslmode=None):
+    '''Connect to both DBs and open a cursor on each.'''
+    pconn, rconn = connect(sslmode)
+
+    primary = pconn.cursor(cursor_factory=psycopg2.extras.DictCursor)
+    replica = rconn.cursor(cursor_factory=psycopg2.extras.DictCursor)
 
     return primary, replica
 
@@ -56,11 +96,33 @@ def _minmax(cursor, table):
     return result['min'], result['max']
 
 
-def _get(cursor, table, id_):
+def _columns(primary, replica, table):
+    '''List the columns the table has on both databases, quoted and in primary order.
+    Selecting them by name keeps both sides in the same order and leaves anything else on the server.
+    Looked up once per table; every check after the first reuses it.'''
+    if table in _known_columns:
+        return _known_columns[table]
+
+    query = 'SELECT attname FROM pg_attribute WHERE attrelid = %s::regclass AND attnum > 0 AND NOT attisdropped ORDER BY attnum'
+    pcursor, rcursor = _parallel(_exec, primary, replica, query, (table,))
+    pcolumns = [row['attname'] for row in pcursor.fetchall()]
+    rcolumns = [row['attname'] for row in rcursor.fetchall()]
+
+    if set(pcolumns) != set(rcolumns):
+        _error2('Columns do not match. primary only: {}, replica only: {}'.format(
+            ', '.join(c for c in pcolumns if c not in rcolumns) or '-',
+            ', '.join(c for c in rcolumns if c not in pcolumns) or '-'))
+
+    _known_columns[table] = ', '.join('"{}"'.format(c.replace('"', '""')) for c in pcolumns if c in rcolumns)
+
+    return _known_columns[table]
+
+
+def _get(cursor, table, columns, id_):
     assert id_ is not None
     assert table is not None
 
-    query = 'SELECT * FROM {table} WHERE id = %s LIMIT 1'.format(table=table)
+    query = 'SELECT {columns} FROM {table} WHERE id = %s LIMIT 1'.format(columns=columns, table=table)
 
     cursor.execute(query, (id_,))
     _debug(cursor)
@@ -68,6 +130,64 @@ def _get(cursor, table, id_):
     return cursor.fetchone()
 
 
+def _get_many(cursor, table, columns, ids):
+    '''Fetch the rows at the given ids in one round-trip, keyed by id.'''
+    assert table is not None
+
+    query = 'SELECT {columns} FROM {table} WHERE id = ANY(%s) ORDER BY id'.format(columns=columns, table=table)
+
+    cursor.execute(query, (list(ids),))
+    _debug(cursor)
+
+    return {row['id']: row for row in cursor.fetchall()}
+
+
+def _hash_many(cursor, table, columns, ids):
+    '''Fetch an md5 of the rows at the given ids in one round-trip, keyed by id.
+    Comparing hashes saves us from sending whole rows over the wire when they match,
+    and COPY saves us from decoding them one row at a time.'''
+    assert table is not None
+
+    query = cursor.mogrify('SELECT id, md5(ROW({columns})::text) FROM {table} WHERE id = ANY(%s)'.format(columns=columns, table=table), (list(ids),))
+    query = 'COPY ({}) TO STDOUT'.format(query.decode('utf-8'))
+
+    buf = io.StringIO()
+    cursor.copy_expert(query, buf)
+    _debug2('{}: {}'.format(cursor.connection.dsn, query))
+
+    hashes = {}
+    for line in buf.getvalue().splitlines():
+        id_, hash_ = line.split('\t')
+        hashes[int(id_)] = hash_
+
+    return hashes
+
+
+def _diff_many(primary, replica, table, columns, ids):
+    '''Fetch the full rows for ids whose hashes did not match and report the ones that are different.'''
+    if not ids:
+        return
+
+    primaries, replicas = _parallel(_get_many, primary, replica, table, columns, ids)
+    for id_ in ids:
+        p = primaries.get(id_)
+        r = replicas.get(id_)
+        if p is None or r is None:
+            continue # Deleted since we hashed it
+        # Both sides selected the same columns in the same order, so compare them as lists.
+        if p != r:
+            _error(dict(p), dict(r))
+
+
+def _batches(items, size=BATCH_SIZE):
+    '''Split items into lists of at most size items, without building the whole list first.'''
+    items = iter(items)
+    batch = list(itertools.islice(items, size))
+    while batch:
+        yield batch
+        batch = list(itertools.islice(items, size))
+
+
 def _exec(cursor, query, params=tuple()):
     cursor.execute(query, params)
     _debug(cursor)
@@ -75,35 +195,149 @@ def _exec(cursor, query, params=tuple()):
     return cursor
 
 
-def _pick(cursor, table, mi, ma):
-    assert mi is not None
-    assert ma is not None
+def _stream(cursor, name, query, params=tuple()):
+    '''Run the query in a server-side cursor, so the rows can be fetched a page at a time instead of all at once.
+    Named cursors can only be executed once, so this opens a new one every time; close it when done.'''
+    stream = cursor.connection.cursor('auditor_{}'.format(name), cursor_factory=psycopg2.extras.DictCursor)
+    stream.execute(query, params)
+    _debug(stream)
+
+    return stream
+
+
+def _prefetch(cursor):
+    '''Iterate over the cursor while a thread fetches the next PAGE_SIZE rows in the background,
+    so waiting on the server overlaps with comparing the rows we already have.
+    The thread starts right away, so prefetches on both sides run at the same time.
+    Returns the rows and a function that stops the thread; call it before closing the cursor,
+    whether or not the rows were read.'''
+    pages = queue.Queue(maxsize=2)
+    stop = threading.Event()
+
+    def fetch():
+        try:
+            while not stop.is_set():
+                page = cursor.fetchmany(PAGE_SIZE)
+                pages.put(page)
+                if not page:
+                    return
+        except Exception as e:
+            pages.put(e)
+
+    thread = threading.Thread(target=fetch, daemon=True)
+    thread.start()
+
+    def rows():
+        while True:
+            page = pages.get()
+            if isinstance(page, Exception):
+                raise page
+            if not page:
+                return
+            yield from page
+
+    def close():
+        # Let the thread finish its last fetch, unblocking it if the queue is full.
+        stop.set()
+        while thread.is_alive():
+            try:
+                pages.get(timeout=0.1)
+            except queue.Empty:
+                pass
+
+    return rows(), close
+
+
+def _merge(primary, replica):
+    '''Walk two iterators of rows ordered by id descending side by side, until either of them runs out.
+    Yields (id, primary row or None, replica row or None).'''
+    p = next(primary, None)
+    r = next(replica, None)
+
+    while p is not None and r is not None:
+        if p['id'] > r['id']:
+            yield p['id'], p, None
+            p = next(primary, None)
+        elif p['id'] < r['id']:
+            yield r['id'], None, r
+            r = next(replica, None)
+        else:
+            yield p['id'], p, r
+            p = next(primary, None)
+            r = next(replica, None)
+
+
+def _start_pool(processes=2):
+    '''Create the pool _parallel runs on, unless there already is one. Safe to call from any thread.'''
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPool(processes=processes)
+        return _pool
+
+
+def _stop_pool():
+    '''Shut down the pool _parallel runs on; the next _parallel call starts a new one.'''
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool.join()
+            _pool = None
 
-    result = None
-    attempts = 0
-    ids = []
 
-    while result is None and attempts < 3:
-        id_ = random.randint(mi, ma)
-        result = _get(cursor, table, id_)
-        attempts += 1
-        ids.append(id_)
+def _parallel(func, primary, replica, *args):
+    '''Run func against the primary and the replica at the same time,
+    so we wait for the slower of the two instead of both in a row.'''
+    pool = _start_pool()
 
-    return result, ids
+    presult = pool.apply_async(func, (primary,) + args)
+    rresult = pool.apply_async(func, (replica,) + args)
+
+    return presult.get(), rresult.get()
+
+
+def _pick_many(primary, replica, table, columns, mi, ma, n):
+    '''Pick n rows at random from the primary, giving each pick up to 3 attempts.
+    Returns (id, primary hash, replica hash or None) for every pick and the ids attempted for every pick that found nothing.'''
+    assert mi is not None
+    assert ma is not None
+
+    picked = []
+    pending = [[] for _ in range(n)]
+
+    for _ in range(3):
+        if not pending:
+            break
+        for ids in pending:
+            ids.append(random.randint(mi, ma))
+        # Picks that drew the same id share one lookup.
+        unique = sorted(set(ids[-1] for ids in pending))
+        phashes, rhashes = _parallel(_hash_many, primary, replica, table, columns, unique)
+        missing = []
+        for ids in pending:
+            id_ = ids[-1]
+            if id_ not in phashes:
+                missing.append(ids)
+            else:
+                picked.append((id_, phashes[id_], rhashes.get(id_)))
+        pending = missing
+
+    return picked, pending
 
 
 def _result(checked, skipped):
-    print(Fore.GREEN, '\bChecked: {}'.format(checked), Fore.RESET)
-    print(Fore.GREEN, '\bSkipped: {}'.format(skipped), Fore.RESET)
+    print(Fore.GREEN + 'Checked: {}'.format(checked) + Fore.RESET)
+    print(Fore.GREEN + 'Skipped: {}'.format(skipped) + Fore.RESET)
 
 
 def _result2(text):
-    print(Fore.GREEN, '\b{}'.format(text), Fore.RESET)
+    print(Fore.GREEN + '{}'.format(text) + Fore.RESET)
 
 
 def _error(p, r):
     id_ = p['id']
-    print(Fore.RED, '\bRows at id = {} are different'.format(id_), Fore.RESET)
+    print(Fore.RED + 'Rows at id = {} are different'.format(id_) + Fore.RESET)
     print(diff(p, r))
     _debug2('primary: {}'.format(p))
     _debug2('replica: {}'.format(r))
@@ -112,65 +346,96 @@ def _error(p, r):
 
 
 def _error2(text):
-    print(Fore.RED, '\b{}'.format(text), Fore.RESET)
+    print(Fore.RED + '{}'.format(text) + Fore.RESET)
     if os.getenv('EXIT_ON_ERROR'):
         exit(1)
 
 
 def _announce(name, table):
-    print(Fore.YELLOW, '\bRunning check "{}" on table "{}"'.format(name, table), Fore.RESET)
+    print(Fore.YELLOW + 'Running check "{}" on table "{}"'.format(name, table) + Fore.RESET)
 
 
 def _check_if_empty(cursor, table):
-    cursor.execute("SELECT * FROM {} LIMIT 1".format(table))
+    cursor.execute("SELECT 1 FROM {} LIMIT 1".format(table))
     return cursor.fetchone() is None
 
 
-def randcheck(primary, replica, table, rows, show_skipped):
-    '''Check rows at random.'''
+def randcheck(pairs, table, rows, show_skipped, workers=WORKERS, sslmode=None):
+    '''Check rows at random, spreading the batches over workers (primary, replica) cursor pairs.
+    Opens whatever pairs are missing from the list and adds them to it, so the next table reuses them.'''
     _announce('random check', table)
+    missing = max(workers, 1) - len(pairs)
+    if missing > 0:
+        with ThreadPool(processes=missing) as connecting:
+            pairs.extend(connecting.map(lambda _: _cursors(sslmode), range(missing)))
+    primary, replica = pairs[0]
+    columns = _columns(primary, replica, table)
     rmin, rmax = _minmax(primary, table)
 
+    # Every pair is used by one thread at a time; take one out, put it back when done.
+    free = queue.Queue()
+    for pair in pairs:
+        free.put(pair)
+
+    def pick(batch):
+        primary, replica = free.get()
+        try:
+            return len(batch), _pick_many(primary, replica, table, columns, rmin, rmax, len(batch))
+        finally:
+            free.put((primary, replica))
+
     checked = 0
     skipped = 0
-    for _ in tqdm(range(rows)):
-        p, attempts = _pick(primary, table, rmin, rmax)
-        if p is None:
-            skipped += 1
+    with tqdm(total=rows) as pbar, ThreadPool(processes=len(pairs)) as workers:
+        # Report on this thread, so EXIT_ON_ERROR still exits.
+        for size, (picked, attempts) in workers.imap_unordered(pick, _batches(range(rows))):
+            skipped += len(attempts)
             if show_skipped:
-                _debug3('Skipped: {}'.format(', '.join(map(lambda x: str(x), attempts))))
-            continue
-        r = _get(replica, table, p['id'])
-        if r is None:
-            _error2('Row does not exist on replica at id = {}'.format(p['id']))
-        else:
-            assert r['id'] == p['id'] # Kind of obvious, but let's not leave anything out
-            _debug2('Comparing id = {}'.format(r['id']))
-            if dict(p) != dict(r):
-                _error(dict(p), dict(r))
-            checked += 1
+                for ids in attempts:
+                    _debug3('Skipped: {}'.format(', '.join(map(lambda x: str(x), ids))))
+            different = []
+            for id_, p, r in picked:
+                if r is None:
+                    _error2('Row does not exist on replica at id = {}'.format(id_))
+                else:
+                    if p != r:
+                        different.append(id_)
+                    checked += 1
+            if different:
+                primary, replica = free.get()
+                _diff_many(primary, replica, table, columns, different)
+                free.put((primary, replica))
+            pbar.update(size)
     _result(checked, skipped)
 
 
 def last_1000(primary, replica, table, show_skipped):
     _announce('last 1000', table)
-    _, rmax = _minmax(primary, table)
-    rmin = rmax - 1000
+    columns = _columns(primary, replica, table)
+
+    # Walk back from the newest row on each side; a row only one side has is lag, not a mismatch.
+    query = 'SELECT id, md5(ROW({})::text) AS "hash" FROM {} ORDER BY id DESC LIMIT %s'.format(columns, table)
+    pstream, rstream = _parallel(_stream, primary, replica, 'last_1000', query, (1000,))
 
     checked = 0
     skipped = 0
-    for id_ in tqdm(range(rmin, rmax)):
-        p = _get(primary, table, id_)
-        r = _get(replica, table, id_)
-        if p is None or r is None:
-            skipped += 1
-            if show_skipped:
-                _debug3('Skipped: {}'.format(id_))
-            continue
-        assert p['id'] == r['id']
-        if dict(p) != dict(r):
-            _error(dict(p), dict(r))
-        checked += 1
+    different = []
+    with pstream, rstream:
+        (prows, pclose), (rrows, rclose) = _prefetch(pstream), _prefetch(rstream)
+        try:
+            for id_, p, r in tqdm(_merge(prows, rrows), total=1000, mininterval=0.25, miniters=64):
+                if p is None or r is None:
+                    skipped += 1
+                    if show_skipped:
+                        _debug3('Skipped: {}'.format(id_))
+                    continue
+                if p['hash'] != r['hash']:
+                    different.append(id_)
+                checked += 1
+        finally:
+            pclose()
+            rclose()
+    _diff_many(primary, replica, table, columns, different)
     _result(checked, skipped)
 
 
@@ -178,8 +443,7 @@ def lag(primary, replica, table, column='updated_at'):
     '''Check logical lag between primary and replica table using Django/Rails "updated_at".'''
     _announce('replica lag', table)
     query = 'SELECT MAX({column}) AS "max" FROM "{table}"'.format(column=column, table=table)
-    primary = _exec(primary, query)
-    replica = _exec(replica, query)
+    primary, replica = _parallel(_exec, primary, replica, query)
     p = primary.fetchone()['max']
     r = replica.fetchone()['max']
 
@@ -195,8 +459,7 @@ def lag(primary, replica, table, column='updated_at'):
 def minmax(primary, replica, table):
     '''Check MIN(id) and MAX(id) match between primary and replica.'''
     _announce('minmax', table)
-    pmin, pmax = _minmax(primary, table)
-    rmin, rmax = _minmax(replica, table)
+    (pmin, pmax), (rmin, rmax) = _parallel(_minmax, primary, replica, table)
 
     if rmin != pmin:
         _error2('Minimum does not match. replica: {}, primary: {}'.format(rmin, pmin))
@@ -214,13 +477,14 @@ def bulk_1000_sum(primary, replica, table):
     _announce('bulk 1000 sum', table)
     rmin, rmax = _minmax(replica, table)
     blocks = max(round(rmax / 1000), 1) # Never have 0 here if not enough rows
+    query = 'SELECT SUM(id::bigint) AS "sum" FROM {} WHERE id > %s AND id < %s'.format(table)
     for _ in tqdm(range(1000)):
         block = random.randint(1, blocks)
-        query = 'SELECT SUM(id::bigint) AS "sum" FROM {} WHERE id > %s AND id < %s'.format(table)
         gt = block * 1000
         lt = gt + 1000
-        psum = _exec(primary, query, (gt, lt)).fetchone()['sum']
-        rsum = _exec(replica, query, (gt, lt)).fetchone()['sum']
+        pcursor, rcursor = _parallel(_exec, primary, replica, query, (gt, lt))
+        psum = pcursor.fetchone()['sum']
+        rsum = rcursor.fetchone()['sum']
         _debug2('primary: {}'.format(psum))
         _debug2('replica: {}'.format(rsum))
 
@@ -244,14 +508,10 @@ def slow_count_all_rows(primary, replica, table, column, before = datetime.now()
 
     query = 'SET statement_timeout = 0; SELECT COUNT({}) AS "count", SUM({}) AS "sum" FROM {} WHERE {} <= %s'.format(column, column, table, column)
 
-    ppool = ThreadPool(processes=1)
-    rpool = ThreadPool(processes=1)
-
-    presult = ppool.apply_async(_exec, (primary, query, (before,)))
-    rresult = rpool.apply_async(_exec, (replica, query, (before,)))
+    pcursor, rcursor = _parallel(_exec, primary, replica, query, (before,))
 
-    p = presult.get().fetchone()
-    r = rresult.get().fetchone()
+    p = pcursor.fetchone()
+    r = rcursor.fetchone()
 
     if p['count'] != r['count']:
         _error2('Count failed with replica = {} and primary = {}'.format(r['count'], p['count']))
@@ -265,6 +525,7 @@ def find_missing_seq_records(primary, replica, table, step_size):
     '''This assumes that a sequential chunk of records will be missing or not updated,
     we will hit one of those records.'''
     _announce('find missing records', table)
+    columns = _columns(primary, replica, table)
     pmin, pmax = _minmax(primary, table)
     range_ = pmax - pmin
     step_size = round(range_ * step_size)
@@ -274,24 +535,39 @@ def find_missing_seq_records(primary, replica, table, step_size):
         _error2('Not enough rows to run this test.')
         return
 
-    for step in tqdm(range(steps)):
-        id_ = pmin + step * step_size
-        r = _get(replica, table, id_)
-        p = _get(primary, table, id_)
-        if not r and p:
-            _error2('Row does not exist on replica at id = {}'.format(id_))
-            return
-        if p != r:
-           _error(p, r)
-           return
+    with tqdm(total=steps) as pbar:
+        for ids in _batches(pmin + step * step_size for step in range(steps)):
+            phashes, rhashes = _parallel(_hash_many, primary, replica, table, columns, ids)
+            # One dict comparison in C for the whole batch; only walk it id by id if something is off.
+            if phashes == rhashes:
+                pbar.update(len(ids))
+                continue
+            # Fetch every row whose hash differs in one go, then report the first problem in id order.
+            different = [id_ for id_ in ids if phashes.get(id_) and rhashes.get(id_) and phashes[id_] != rhashes[id_]]
+            primaries, replicas = _parallel(_get_many, primary, replica, table, columns, different) if different else ({}, {})
+            for id_ in ids:
+                p = phashes.get(id_)
+                r = rhashes.get(id_)
+                if not r and p:
+                    _error2('Row does not exist on replica at id = {}'.format(id_))
+                    return
+                if not p and r:
+                    _error2('Row does not exist on primary at id = {}'.format(id_))
+                    return
+                if p != r:
+                    p, r = primaries.get(id_), replicas.get(id_)
+                    if p is not None and r is not None and p != r:
+                        _error(dict(p), dict(r))
+                        return
+            pbar.update(len(ids))
     _result2('OK')
 
 
 def check_one_row(primary, replica, table, row_id):
     '''Just check one row...'''
     _announce('one row check', table)
-    r = _get(replica, table, row_id)
-    p = _get(primary, table, row_id)
+    columns = _columns(primary, replica, table)
+    p, r = _parallel(_get, primary, replica, table, columns, row_id)
 
     if p is None:
         _error2('Row does not exist on the primary.')
@@ -303,14 +579,24 @@ def check_one_row(primary, replica, table, row_id):
         _result2('OK.')
 
 
-def main(table, rows, exclude_tables, lag_column, show_skipped, count_before, step_size, row_id, slow_check):
-    print(Fore.CYAN, '\b=== Welcome to the Postgres auditor v{} ==='.format(VERSION), Fore.RESET)
-    print()
+def main(table, rows, exclude_tables, lag_column, show_skipped, count_before, step_size, row_id, slow_check, workers=WORKERS, sslmode=None):
+    global _debugging
+    _debugging = bool(os.getenv('DEBUG'))
 
-    pconn, rconn = connect()
+    # Each randcheck worker runs both of its queries through _parallel at the same time.
+    _start_pool(processes=2 * max(workers, 1))
+    try:
+        _main(table, rows, exclude_tables, lag_column, show_skipped, count_before, step_size, row_id, slow_check, workers, sslmode)
+    finally:
+        _stop_pool()
 
-    primary = pconn.cursor(cursor_factory=psycopg2.extras.DictCursor)
-    replica = rconn.cursor(cursor_factory=psycopg2.extras.DictCursor)
+
+def _main(table, rows, exclude_tables, lag_column, show_skipped, count_before, step_size, row_id, slow_check, workers, sslmode):
+    print(Fore.CYAN + '=== Welcome to the Postgres auditor v{} ==='.format(VERSION) + Fore.RESET)
+    print()
+
+    primary, replica = _cursors(sslmode)
+    pairs = [(primary, replica)] # randcheck opens the rest when it first runs
 
     _debug2('Primary: {}'.format(primary.connection.dsn))
     _debug2('Replica: {}'.format(replica.connection.dsn))
@@ -336,8 +622,7 @@ def main(table, rows, exclude_tables, lag_column, show_skipped, count_before, st
             return
 
         # Stop checking empty tables, it breaks my math
-        pempty = _check_if_empty(primary, table)
-        rempty = _check_if_empty(replica, table)
+        pempty, rempty = _parallel(_check_if_empty, primary, replica, table)
 
         if pempty and rempty:
             _result2('Skipping empty table "{}"'.format(table))
@@ -357,7 +642,7 @@ def main(table, rows, exclude_tables, lag_column, show_skipped, count_before, st
         print()
         find_missing_seq_records(primary, replica, table, step_size)
         print()
-        randcheck(primary, replica, table, rows, show_skipped)
+        randcheck(pairs, table, rows, show_skipped, workers, sslmode)
         print()
         bulk_1000_sum(primary, replica, table)
         print()
@@ -380,7 +665,9 @@ def main(table, rows, exclude_tables, lag_column, show_skipped, count_before, st
 @click.option('--step-size', default=0.0001, help='The size of the search step for find missing sequential records test.')
 @click.option('--row-id', default=None, help='Compare this specific row given id.')
 @click.option('--slow-check/--no-slow-check', default=True, help='Run/Do not run the slow check that counts and sums all rows.')
-def checksummer(primary, replica, table, debug, rows, exclude_tables, lag_column, show_skipped, count_before, exit_on_error, step_size, row_id, slow_check):
+@click.option('--workers', default=WORKERS, help='Number of primary/replica connection pairs to run the randcheck with.')
+@click.option('--sslmode', default=None, type=click.Choice(SSLMODES), help='Override sslmode for both connections, e.g. "disable" on a trusted network.')
+def checksummer(primary, replica, table, debug, rows, exclude_tables, lag_column, show_skipped, count_before, exit_on_error, step_size, row_id, slow_check, workers, sslmode):
     os.environ['REPLICA_DB_URL'] = replica
     os.environ['PRIMARY_DB_URL'] = primary
 
@@ -389,5 +676,5 @@ def checksummer(primary, replica, table, debug, rows, exclude_tables, lag_column
     if exit_on_error:
         os.environ['EXIT_ON_ERROR'] = 'True'
 
-    main(table, rows, exclude_tables.split(','), lag_column, show_skipped, count_before, step_size, row_id, slow_check)
+    main(table, rows, exclude_tables.split(','), lag_column, show_skipped, count_before, step_size, row_id, slow_check, workers, sslmode)
 